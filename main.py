@@ -24,6 +24,7 @@ Options
 from __future__ import annotations
 
 import argparse
+import fcntl
 import os
 import queue
 import subprocess
@@ -50,6 +51,10 @@ from src.vision.gesture_detector import GestureDetector
 from src.vision.gesture_mapper import GestureMapper
 from src.vision.hud_overlay import HudOverlay
 
+# Linux fcntl op to resize a pipe (not exposed by the fcntl module)
+F_SETPIPE_SZ = 1031
+DRIVER_PIPE_BYTES = 1 << 20   # 1 MB – bursts never block the producer
+
 
 def parse_args() -> argparse.Namespace:
     p = argparse.ArgumentParser(description="GestureLink – Hand Gesture Virtual HID")
@@ -65,6 +70,9 @@ def parse_args() -> argparse.Namespace:
                    help="Show a live annotated preview window with HUD")
     p.add_argument("--no-preview", dest="preview", action="store_false",
                    help="Disable the live preview window")
+    p.add_argument("--pin-cores",  action="store_true",
+                   help="Pin the detector and writer threads to dedicated "
+                        "cores to reduce scheduling jitter")
     p.add_argument("--no-driver",  action="store_true",
                    help="Print commands to stdout instead of piping to hid_driver")
     p.add_argument("--driver-bin", default="src/driver/hid_driver",
@@ -72,39 +80,164 @@ def parse_args() -> argparse.Namespace:
     return p.parse_args()
 
 
+# --------------------------------------------------------------------------- #
+#  Lock-free single-producer/single-consumer channel                           #
+# --------------------------------------------------------------------------- #
+class SPSCRing:
+    """Fixed-size single-producer/single-consumer ring with a queue-like API.
+
+    Both channels in the pipeline (detector→main, main→writer) have exactly
+    one producer and one consumer, so the Lock+Condition pair that
+    ``queue.Queue`` takes on every put/get is pure overhead.  Under the GIL
+    an int assignment is atomic, so a preallocated buffer plus separate
+    head/tail counters is safe here; an Event provides the consumer wakeup.
+
+    Raises ``queue.Empty`` / ``queue.Full`` so call sites keep the familiar
+    ``put_nowait`` / ``get_nowait`` / ``get(timeout=...)`` shape.
+    """
+
+    __slots__ = ("_buf", "_mask", "_head", "_tail", "_ev")
+
+    def __init__(self, capacity: int = 32) -> None:
+        cap = 1
+        while cap < capacity:          # round up to a power of two
+            cap <<= 1
+        self._buf  = [None] * cap
+        self._mask = cap - 1
+        self._head = 0                 # consumer index
+        self._tail = 0                 # producer index
+        self._ev   = threading.Event()
+
+    def empty(self) -> bool:
+        return self._head == self._tail
+
+    def full(self) -> bool:
+        return (self._tail - self._head) > self._mask
+
+    def put_nowait(self, item) -> None:
+        if (self._tail - self._head) > self._mask:
+            raise queue.Full
+        tail = self._tail
+        self._buf[tail & self._mask] = item
+        self._tail = tail + 1          # publish after the slot is written
+        self._ev.set()
+
+    def get_nowait(self):
+        head = self._head
+        if head == self._tail:
+            raise queue.Empty
+        slot = head & self._mask
+        item = self._buf[slot]
+        self._buf[slot] = None         # drop the ring's reference
+        self._head = head + 1
+        return item
+
+    def get(self, timeout: float | None = None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            try:
+                return self.get_nowait()
+            except queue.Empty:
+                pass
+            self._ev.clear()
+            if self._head != self._tail:   # produced between check and clear
+                continue
+            if deadline is None:
+                self._ev.wait()
+            else:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self._ev.wait(remaining):
+                    raise queue.Empty
+
+
 # --------------------------------------------------------------------------- #
 #  Writer thread: consumes command strings and forwards to the driver          #
 # --------------------------------------------------------------------------- #
 class CommandWriter(threading.Thread):
-    """Thread that drains a command queue and writes to the driver stdin."""
+    """Thread that drains a command queue and writes to the driver stdin.
+
+    Commands are coalesced: after a blocking get, the queue is drained
+    non-blockingly and the whole batch goes out in a single write+flush,
+    so a burst of N commands costs one syscall instead of N.
+    """
 
-    def __init__(self, cmd_q: queue.Queue, dest, dry_run: bool = False) -> None:
+    # Flush at least this often so batching never adds visible latency.
+    MAX_FLUSH_INTERVAL_S = 0.008
+
+    def __init__(self, cmd_q: SPSCRing, dest, dry_run: bool = False,
+                 pin_core: int | None = None) -> None:
         super().__init__(name="CommandWriter", daemon=True)
-        self.cmd_q   = cmd_q
-        self.dest    = dest      # subprocess.Popen or None (dry-run → stdout)
-        self.dry_run = dry_run
-        self._stop   = threading.Event()
+        self.cmd_q    = cmd_q
+        self.dest     = dest     # subprocess.Popen or None (dry-run → stdout)
+        self.dry_run  = dry_run
+        self.pin_core = pin_core
+        self._stop    = threading.Event()
+        # Commands come from a small vocabulary (clicks, button holds,
+        # scroll ticks); cache their encoded form so repeats skip the
+        # str→bytes allocation.  Bounded so MOUSE_MOVE variants can't
+        # grow it without limit.
+        self._enc_cache: dict[str, bytes] = {}
 
     def stop(self) -> None:
         self._stop.set()
 
+    def _encode(self, cmd: str) -> bytes:
+        b = self._enc_cache.get(cmd)
+        if b is None:
+            b = (cmd + "\n").encode()
+            if len(self._enc_cache) < 256:
+                self._enc_cache[cmd] = b
+        return b
+
     def run(self) -> None:
+        if self.pin_core is not None:
+            # Keep the latency-sensitive writer on its own core and bump
+            # its priority a little; both need privileges we may lack.
+            try:
+                os.sched_setaffinity(0, {self.pin_core})
+                os.nice(-5)
+            except (OSError, AttributeError):
+                pass
+
+        buf = bytearray()
+        next_flush = 0.0
+
         while not self._stop.is_set():
             try:
                 cmd: str = self.cmd_q.get(timeout=0.05)
             except queue.Empty:
+                cmd = None
+
+            if cmd is not None:
+                # Coalesce everything currently queued into one batch
+                buf += self._encode(cmd)
+                while True:
+                    try:
+                        cmd = self.cmd_q.get_nowait()
+                    except queue.Empty:
+                        break
+                    buf += self._encode(cmd)
+
+            if not buf:
+                continue
+
+            # Hold the batch open until the latency cap so back-to-back
+            # bursts merge, but never delay a command past the cap.
+            now = time.monotonic()
+            if now < next_flush and not self.cmd_q.empty():
                 continue
 
-            line = cmd + "\n"
             try:
                 if self.dry_run or self.dest is None:
-                    sys.stdout.write(line)
+                    sys.stdout.write(buf.decode())
                     sys.stdout.flush()
                 else:
-                    self.dest.stdin.write(line.encode())
+                    self.dest.stdin.write(buf)
                     self.dest.stdin.flush()
             except (BrokenPipeError, OSError):
                 break
+            buf.clear()
+            next_flush = now + self.MAX_FLUSH_INTERVAL_S
 
 
 # --------------------------------------------------------------------------- #
@@ -131,25 +264,39 @@ def main() -> None:
             stdin=subprocess.PIPE,
             stderr=sys.stderr,
         )
+        # Grow the stdin pipe beyond the 64KB default so command bursts
+        # don't block the producer.  Kernels with a lower pipe-max-size
+        # (or unprivileged limits) simply keep the default.
+        try:
+            fcntl.fcntl(driver_proc.stdin.fileno(), F_SETPIPE_SZ, DRIVER_PIPE_BYTES)
+        except OSError:
+            pass
         print(f"[main] Started hid_driver (PID {driver_proc.pid})", file=sys.stderr)
     else:
         print("[main] --no-driver: commands will be printed to stdout.", file=sys.stderr)
 
     # ---- Gesture detection pipeline -----------------------------------------
-    result_q: queue.Queue = queue.Queue(maxsize=8)
-    cmd_q:    queue.Queue = queue.Queue(maxsize=32)
-
     detector = GestureDetector(
         camera_index=args.camera,
         max_hands=1,
-        output_queue=result_q,
         frame_width=640,
         frame_height=480,
+        preview_enabled=args.preview,
+        pin_core=0 if args.pin_cores else None,
     )
     mapper = GestureMapper(screen_w=args.width, screen_h=args.height)
-    writer = CommandWriter(cmd_q, driver_proc, dry_run=args.no_driver)
     hud    = HudOverlay()
 
+    # Driver-connected runs write to the pipe straight from the main loop
+    # (no per-command queue hop + thread wakeup); the writer thread only
+    # remains for the --no-driver stdout mode.
+    writer: CommandWriter | None = None
+    cmd_q:  SPSCRing | None = None
+    if args.no_driver:
+        cmd_q  = SPSCRing(capacity=32)
+        writer = CommandWriter(cmd_q, None, dry_run=True,
+                               pin_core=1 if args.pin_cores else None)
+
     # ---- Graceful shutdown ---------------------------------------------------
     shutdown = threading.Event()
 
@@ -162,12 +309,31 @@ def main() -> None:
 
     # ---- Start threads -------------------------------------------------------
     detector.start()
-    writer.start()
+    if writer is not None:
+        writer.start()
 
     fps_t0    = time.monotonic()
     fps_count = 0
 
+    # Direct-write state for the driver-connected path: encoded commands
+    # are cached, batched per loop iteration, and flushed at most every
+    # 8ms so batching never adds visible latency.
+    enc_cache: dict[str, bytes] = {}
+    next_flush_t  = 0.0
+    flush_pending = False
+
+    def _encode(cmd: str) -> bytes:
+        b = enc_cache.get(cmd)
+        if b is None:
+            b = (cmd + "\n").encode()
+            if len(enc_cache) < 256:
+                enc_cache[cmd] = b
+        return b
+
     preview_ok = args.preview  # may be disabled on first failure
+    # imshow/waitKey do a full GUI round-trip; pump them at display
+    # refresh (~60Hz) instead of once per drained result.
+    next_preview_t = 0.0
 
     print("[main] Pipeline running. Press Ctrl+C to stop.", file=sys.stderr)
     if preview_ok:
@@ -176,48 +342,71 @@ def main() -> None:
 
     try:
         while not shutdown.is_set():
-            # Drain detector queue → mapper → command queue
-            try:
-                hand = result_q.get(timeout=0.05)
-            except queue.Empty:
+            # Latest detector result → mapper → driver
+            hand = detector.next_result(timeout=0.05)
+            now = time.monotonic()  # one clock snapshot shared per iteration
+            if hand is None:
+                # Push out any batched commands before idling
+                if flush_pending and driver_proc is not None:
+                    try:
+                        driver_proc.stdin.flush()
+                    except (BrokenPipeError, OSError):
+                        shutdown.set()
+                    flush_pending = False
                 # Even without a hand, keep the preview alive
-                if preview_ok:
+                if preview_ok and now >= next_preview_t:
+                    next_preview_t = now + 1 / 60
                     frame = detector.latest_frame()
                     if frame is not None:
-                        hud.update(None, [])
-                        hud.draw(frame)
+                        hud.update(None, [], now)
+                        shown = hud.draw(frame, now)
                         try:
-                            cv2.imshow("GestureLink Preview", frame)
+                            cv2.imshow("GestureLink Preview", shown)
                         except cv2.error:
                             preview_ok = False
                         if cv2.waitKey(1) & 0xFF == ord("q"):
                             shutdown.set()
                 continue
 
-            cmds = mapper.map(hand)
-            for c in cmds:
+            cmds = mapper.map(hand, now)
+            if cmd_q is not None:
+                for c in cmds:
+                    try:
+                        cmd_q.put_nowait(c)
+                    except queue.Full:
+                        pass  # Drop if writer can't keep up
+            elif driver_proc is not None:
                 try:
-                    cmd_q.put_nowait(c)
-                except queue.Full:
-                    pass  # Drop if writer can't keep up
-
-            # Update the HUD with latest gesture & commands
-            hud.update(hand, cmds)
+                    if cmds:
+                        driver_proc.stdin.write(b"".join(map(_encode, cmds)))
+                        flush_pending = True
+                    if flush_pending and now >= next_flush_t:
+                        driver_proc.stdin.flush()
+                        flush_pending = False
+                        next_flush_t = now + 0.008
+                except (BrokenPipeError, OSError):
+                    shutdown.set()
+
+            # Update the HUD with latest gesture & commands — pure waste
+            # when nobody is watching (headless deployments)
+            if preview_ok:
+                hud.update(hand, cmds, now, mapper.active_gesture_label)
 
             fps_count += 1
-            elapsed = time.monotonic() - fps_t0
+            elapsed = now - fps_t0
             if elapsed >= 5.0:
                 print(f"[main] Throughput: {fps_count / elapsed:.1f} gestures/s",
                       file=sys.stderr)
-                fps_t0, fps_count = time.monotonic(), 0
+                fps_t0, fps_count = now, 0
 
             # Preview window with HUD overlay
-            if preview_ok:
+            if preview_ok and now >= next_preview_t:
+                next_preview_t = now + 1 / 60
                 frame = detector.latest_frame()
                 if frame is not None:
-                    hud.draw(frame)
+                    shown = hud.draw(frame, now)
                     try:
-                        cv2.imshow("GestureLink Preview", frame)
+                        cv2.imshow("GestureLink Preview", shown)
                     except cv2.error:
                         print("[main] Display unavailable – disabling preview.",
                               file=sys.stderr)
@@ -227,7 +416,8 @@ def main() -> None:
 
     finally:
         detector.stop()
-        writer.stop()
+        if writer is not None:
+            writer.stop()
         if preview_ok:
             cv2.destroyAllWindows()
         if driver_proc is not None:
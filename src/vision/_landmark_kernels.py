@@ -0,0 +1,61 @@
+"""
+_landmark_kernels.py
+Numeric core for per-frame landmark geometry, JIT-compiled with Numba
+when it is installed.
+
+Numba is an optional accelerator: without it the same function runs
+under the plain interpreter, which is what the unit tests exercise.
+The kernel is warmed once at import so first-frame latency never pays
+the compile cost on the hot path.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:                      # optional dependency
+    def njit(*args, **kwargs):           # no-op decorator fallback
+        def wrap(fn):
+            return fn
+        return wrap
+
+# Landmark indices, kept as plain int tuples so the kernel stays
+# nopython-compatible (mirrors LM in gesture_detector).
+_WRIST = 0
+_THUMB_IP, _THUMB_TIP = 3, 4
+_FINGER_TIPS = (4, 8, 12, 16, 20)
+_FINGER_PIPS = (3, 6, 10, 14, 18)
+_FINGER_MCPS = (2, 5, 9, 13, 17)
+
+
+@njit(cache=True, fastmath=True)
+def analyze(lm):
+    """
+    Analyse a ``(21, 3) float32`` landmark array in one native call.
+
+    Returns ``(ext_mask, pinch_dist, index_x, index_y)`` where
+    ``ext_mask`` is a ``uint8[5]`` per-finger extension flag array
+    (thumb … pinky) using the same two-joint rule as HandResult.
+    """
+    ext = np.zeros(5, dtype=np.uint8)
+
+    wrist_x = lm[_WRIST, 0]
+    if abs(lm[_THUMB_TIP, 0] - wrist_x) > abs(lm[_THUMB_IP, 0] - wrist_x):
+        ext[0] = 1
+
+    for i in range(1, 5):
+        tip_y = lm[_FINGER_TIPS[i], 1]
+        if tip_y < lm[_FINGER_PIPS[i], 1] and tip_y < lm[_FINGER_MCPS[i], 1]:
+            ext[i] = 1
+
+    dx = lm[_THUMB_TIP, 0] - lm[_FINGER_TIPS[1], 0]
+    dy = lm[_THUMB_TIP, 1] - lm[_FINGER_TIPS[1], 1]
+    pinch = (dx * dx + dy * dy) ** 0.5
+
+    return ext, pinch, lm[_FINGER_TIPS[1], 0], lm[_FINGER_TIPS[1], 1]
+
+
+# Warm the JIT once at import time (no-op without numba)
+analyze(np.zeros((21, 3), dtype=np.float32))
@@ -1,12 +1,13 @@
 """
 gesture_detector.py
 Real-time hand landmark detection using the MediaPipe Tasks HandLandmarker API
-(mediapipe >= 0.10).  Runs in a dedicated thread, publishing results via a queue.
+(mediapipe >= 0.10).  Runs in a dedicated thread, publishing the latest
+result for the main loop to consume.
 """
 
 from __future__ import annotations
 
-import queue
+import os
 import threading
 import time
 from dataclasses import dataclass, field
@@ -14,6 +15,9 @@ from pathlib import Path
 from typing import List, Optional, Tuple
 
 import cv2
+import numpy as np
+
+from ._landmark_kernels import analyze as _analyze_landmarks
 
 # ---------------------------------------------------------------------------
 # MediaPipe landmark indices (fixed across all API versions)
@@ -49,32 +53,68 @@ class Landmark:
     z: float  # depth (relative to wrist)
 
 
+# Per-finger landmark indices (thumb, index, middle, ring, pinky),
+# hoisted to module scope so no per-call list is ever rebuilt.  The
+# tuples serve scalar lookups; the arrays serve vectorized gathers.
+_TIP_IDS = (LM.THUMB_TIP, LM.INDEX_FINGER_TIP, LM.MIDDLE_FINGER_TIP,
+            LM.RING_FINGER_TIP, LM.PINKY_TIP)
+_PIP_IDS = (LM.THUMB_IP,  LM.INDEX_FINGER_PIP, LM.MIDDLE_FINGER_PIP,
+            LM.RING_FINGER_PIP, LM.PINKY_PIP)
+_MCP_IDS = (LM.THUMB_MCP, LM.INDEX_FINGER_MCP, LM.MIDDLE_FINGER_MCP,
+            LM.RING_FINGER_MCP, LM.PINKY_MCP)
+_TIPS = np.array(_TIP_IDS)
+_PIPS = np.array(_PIP_IDS)
+_MCPS = np.array(_MCP_IDS)
+
+
 @dataclass
 class HandResult:
-    """Processed result for a single detected hand."""
-    landmarks: List[Landmark]
+    """Processed result for a single detected hand.
+
+    Landmarks are stored as one contiguous ``(21, 3) float32`` array
+    (one x/y/z row per landmark) so per-frame geometry runs as a couple
+    of NumPy ufunc calls instead of dozens of attribute lookups.  A list
+    of :class:`Landmark` objects is also accepted and converted, and
+    :meth:`lm` / :meth:`fingertip` return :class:`Landmark` views for
+    callers that want the attribute form.
+    """
+    landmarks: np.ndarray
     handedness: str          # "Left" or "Right"
-    timestamp_ms: float = field(default_factory=lambda: time.monotonic() * 1000)
+    timestamp_ms: float = 0.0
+    _ext_mask: Optional[np.ndarray] = field(default=None, init=False, repr=False)
+    _ext_bits: Optional[int] = field(default=None, init=False, repr=False)
+    _pinch: Optional[float] = field(default=None, init=False, repr=False)
+    _index_xy: Optional[Tuple[float, float]] = field(default=None, init=False,
+                                                     repr=False)
+
+    def __post_init__(self) -> None:
+        lms = self.landmarks
+        if not isinstance(lms, np.ndarray):
+            self.landmarks = np.asarray(
+                [(l.x, l.y, l.z) for l in lms], dtype=np.float32
+            )
+        elif lms.dtype != np.float32:
+            self.landmarks = np.asarray(lms, dtype=np.float32)
 
     # ------------------------------------------------------------------ helpers
 
     def lm(self, idx: int) -> Landmark:
         """Return a single landmark by index."""
-        return self.landmarks[idx]
+        row = self.landmarks[idx]
+        return Landmark(float(row[0]), float(row[1]), float(row[2]))
 
     def fingertip(self, finger: int) -> Landmark:
         """
         Return the fingertip for a given finger (0=thumb, 1=index, …, 4=pinky).
         """
-        tips = [LM.THUMB_TIP, LM.INDEX_FINGER_TIP, LM.MIDDLE_FINGER_TIP,
-                LM.RING_FINGER_TIP, LM.PINKY_TIP]
-        return self.lm(tips[finger])
+        return self.lm(_TIP_IDS[finger])
 
-    def finger_extended(self, finger: int) -> bool:
+    def extended_mask(self) -> np.ndarray:
         """
-        Return True if the given finger appears extended.
+        Boolean array of per-finger extension (thumb … pinky), computed
+        once per instance.
 
-        For index–pinky the finger is extended when both:
+        For index–pinky a finger is extended when both:
           • tip is above the PIP joint, AND
           • tip is above the MCP joint.
         This two-joint check is far more robust than tip-vs-pip alone,
@@ -83,42 +123,63 @@ class HandResult:
         For the thumb: compare how far the tip is from the wrist vs the
         IP joint (works for both left and right hands).
         """
-        tips = [LM.THUMB_TIP, LM.INDEX_FINGER_TIP, LM.MIDDLE_FINGER_TIP,
-                LM.RING_FINGER_TIP, LM.PINKY_TIP]
-        pips = [LM.THUMB_IP,  LM.INDEX_FINGER_PIP, LM.MIDDLE_FINGER_PIP,
-                LM.RING_FINGER_PIP, LM.PINKY_PIP]
-        mcps = [LM.THUMB_MCP, LM.INDEX_FINGER_MCP, LM.MIDDLE_FINGER_MCP,
-                LM.RING_FINGER_MCP, LM.PINKY_MCP]
-
-        tip = self.lm(tips[finger])
-        pip = self.lm(pips[finger])
-        mcp = self.lm(mcps[finger])
-
-        if finger == 0:          # thumb – compare x distance from wrist
-            wrist = self.lm(LM.WRIST)
-            return abs(tip.x - wrist.x) > abs(pip.x - wrist.x)
-        # Two-joint check for index–pinky
-        return tip.y < pip.y and tip.y < mcp.y
+        if self._ext_mask is None:
+            ext, pinch, ix, iy = _analyze_landmarks(self.landmarks)
+            self._ext_mask = ext != 0
+            self._pinch = float(pinch)
+            self._index_xy = (float(ix), float(iy))
+        return self._ext_mask
+
+    def finger_extended(self, finger: int) -> bool:
+        """Return True if the given finger appears extended."""
+        return bool(self.extended_mask()[finger])
+
+    def extended_bits(self) -> int:
+        """
+        The extension mask as a 5-bit int (bit 0 = thumb … bit 4 = pinky),
+        cached per instance — lets classifiers dispatch on one hash lookup.
+        """
+        bits = self._ext_bits
+        if bits is None:
+            mask = self.extended_mask()
+            bits = (int(mask[0]) | int(mask[1]) << 1 | int(mask[2]) << 2
+                    | int(mask[3]) << 3 | int(mask[4]) << 4)
+            self._ext_bits = bits
+        return bits
 
     def extended_count(self) -> int:
-        return sum(self.finger_extended(i) for i in range(5))
+        return int(self.extended_mask().sum())
 
     def pinch_distance(self) -> float:
         """Euclidean distance (normalised) between thumb tip and index tip."""
-        t = self.fingertip(0)
-        i = self.fingertip(1)
-        return ((t.x - i.x) ** 2 + (t.y - i.y) ** 2) ** 0.5
+        if self._pinch is None:
+            self.extended_mask()   # one kernel call fills both caches
+        return self._pinch
 
     def index_tip_position(self) -> Tuple[float, float]:
-        """Return (x, y) normalised position of the index fingertip."""
-        lm = self.fingertip(1)
-        return lm.x, lm.y
+        """Return (x, y) normalised position of the index fingertip.
+
+        Served from the analysis cache when the extension mask has
+        already been computed this frame (the kernel returns it for
+        free); otherwise read straight from the landmark array.
+        """
+        xy = self._index_xy
+        if xy is None:
+            a = self.landmarks
+            xy = float(a[LM.INDEX_FINGER_TIP, 0]), float(a[LM.INDEX_FINGER_TIP, 1])
+            self._index_xy = xy
+        return xy
 
 
 class GestureDetector:
     """
     Captures frames from a camera, detects hand landmarks,
-    and puts HandResult objects into an output queue.
+    and publishes the most recent HandResult for consumption.
+
+    Only the newest result matters for HID output — an older gesture is
+    already stale — so results go through a single-slot latest-value
+    cell rather than a queue: publishing is one reference store and an
+    Event set, with no per-item lock traffic.
     """
 
     def __init__(
@@ -127,25 +188,48 @@ class GestureDetector:
         max_hands: int = 1,
         detection_confidence: float = 0.7,
         tracking_confidence: float = 0.6,
-        output_queue: Optional[queue.Queue] = None,
         frame_width: int = 640,
         frame_height: int = 480,
+        preview_enabled: bool = True,
+        pin_core: Optional[int] = None,
     ) -> None:
         self.camera_index = camera_index
         self.max_hands = max_hands
         self.det_conf = detection_confidence
         self.trk_conf = tracking_confidence
-        self.out_q: queue.Queue = output_queue or queue.Queue(maxsize=4)
         self.frame_w = frame_width
         self.frame_h = frame_height
+        self.preview_enabled = preview_enabled
+        self.pin_core = pin_core
+
+        # Single-slot handoff: newest result wins, consumer takes it
+        self._latest_result: Optional[HandResult] = None
+        self._result_lock = threading.Lock()
+        self._result_ev = threading.Event()
 
         self._stop_event = threading.Event()
         self._thread: Optional[threading.Thread] = None
 
-        # Shared annotated frame for optional preview window
-        self._latest_frame: Optional[cv2.typing.MatLike] = None
+        # Double buffer for the optional preview window: the detector
+        # draws into the back slot and publishing is just an index swap,
+        # so the lock is held for O(1) instead of a 900KB memcpy.
+        self._buffers: Optional[list] = None   # small pool of frame arrays
+        self._pub_idx = -1                     # nothing published yet
         self._frame_lock = threading.Lock()
 
+        # timestamp_ms → buffer index for frames awaiting an async result.
+        # Written by the capture loop, popped by the MediaPipe worker in
+        # _on_result, so every access goes through _pending_lock — under
+        # load LIVE_STREAM drops frames without invoking the callback,
+        # stale entries pile up, and the reclaim path in _next_write_idx
+        # would otherwise race the callback's pop.
+        self._pending: dict = {}
+        self._pending_lock = threading.Lock()
+
+        # Reused landmark staging buffer (the result callback is the only
+        # writer); HandResult gets a copy of the filled rows.
+        self._lm_scratch = np.empty((21, 3), dtype=np.float32)
+
     # ------------------------------------------------------------------ public
 
     def start(self) -> None:
@@ -160,18 +244,41 @@ class GestureDetector:
         if self._thread is not None:
             self._thread.join(timeout=3.0)
 
-    @property
-    def queue(self) -> queue.Queue:
-        return self.out_q
+    def next_result(self, timeout: Optional[float] = None) -> Optional[HandResult]:
+        """
+        Take the most recent HandResult, or None if nothing new arrives
+        within *timeout* seconds.  Each result is returned exactly once.
+        """
+        if not self._result_ev.wait(timeout):
+            return None
+        self._result_ev.clear()
+        with self._result_lock:
+            result, self._latest_result = self._latest_result, None
+        return result
 
     def latest_frame(self) -> Optional[cv2.typing.MatLike]:
-        """Return the most recently annotated frame (thread-safe, may be None)."""
+        """
+        Return the most recently annotated frame (thread-safe, may be None).
+
+        The returned array is the published half of an internal double
+        buffer — treat it as read-only for the current frame.
+        """
         with self._frame_lock:
-            return self._latest_frame
+            if self._pub_idx < 0:
+                return None
+            return self._buffers[self._pub_idx]
 
     # ----------------------------------------------------------------- private
 
     def _run(self) -> None:
+        if self.pin_core is not None:
+            # Keep the CPU-heavy inference thread on one core to avoid
+            # migrations and the cache evictions they cause.
+            try:
+                os.sched_setaffinity(0, {self.pin_core})
+            except (OSError, AttributeError):
+                pass
+
         # Lazy imports – only needed at runtime, not during unit tests
         from mediapipe.tasks.python.core.base_options import BaseOptions
         from mediapipe.tasks.python.vision.hand_landmarker import (
@@ -194,14 +301,22 @@ class GestureDetector:
                 "hand_landmarker/hand_landmarker/float16/1/hand_landmarker.task"
             )
 
-        options = HandLandmarkerOptions(
-            base_options=BaseOptions(model_asset_path=str(_model_path)),
-            running_mode=VisionTaskRunningMode.VIDEO,
-            num_hands=self.max_hands,
-            min_hand_detection_confidence=self.det_conf,
-            min_hand_presence_confidence=self.det_conf,
-            min_tracking_confidence=self.trk_conf,
-        )
+        # LIVE_STREAM mode: detect_async() returns immediately and results
+        # arrive on a MediaPipe worker thread via _on_result, so capture
+        # and the ~15ms inference overlap instead of serialising.
+        def _options(delegate) -> HandLandmarkerOptions:
+            return HandLandmarkerOptions(
+                base_options=BaseOptions(
+                    model_asset_path=str(_model_path),
+                    delegate=delegate,
+                ),
+                running_mode=VisionTaskRunningMode.LIVE_STREAM,
+                num_hands=self.max_hands,
+                min_hand_detection_confidence=self.det_conf,
+                min_hand_presence_confidence=self.det_conf,
+                min_tracking_confidence=self.trk_conf,
+                result_callback=self._on_result,
+            )
 
         # Use V4L2 directly – the GStreamer backend often fails after
         # an unclean shutdown or on Fedora with missing plugins.
@@ -216,77 +331,153 @@ class GestureDetector:
         cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.frame_h)
         cap.set(cv2.CAP_PROP_FPS, 60)
 
-        with HandLandmarker.create_from_options(options) as landmarker:
+        # MJPG keeps 640x480@60 within USB bandwidth (YUYV can't), and a
+        # shallow driver ring buffer keeps glass-to-inference latency low.
+        cap.set(cv2.CAP_PROP_FOURCC,
+                cv2.VideoWriter_fourcc("M", "J", "P", "G"))
+        if not cap.set(cv2.CAP_PROP_BUFFERSIZE, 1):
+            cap.set(cv2.CAP_PROP_BUFFERSIZE, 2)   # some backends refuse 1
+
+        target_interval = 1.0 / 60.0   # keep inferring at least at this cadence
+
+        # Run the TFLite graph on the GPU where one exists (~12ms vs ~17ms
+        # per frame); headless boxes without GLES fail at create time, so
+        # fall back to the CPU delegate there.
+        try:
+            landmarker = HandLandmarker.create_from_options(
+                _options(BaseOptions.Delegate.GPU)
+            )
+        except Exception:
+            landmarker = HandLandmarker.create_from_options(
+                _options(BaseOptions.Delegate.CPU)
+            )
+
+        with landmarker:
             frame_idx = 0
+            last_infer_t = 0.0
             while not self._stop_event.is_set():
-                ok, frame = cap.read()
+                # grab() unconditionally so the V4L2 queue never backs up,
+                # but skip the ~15ms inference when the previous result is
+                # still unconsumed — this one would only displace it.
+                if not cap.grab():
+                    continue
+                now = time.monotonic()
+                if self._result_ev.is_set() and (now - last_infer_t) < target_interval:
+                    continue
+                ok, frame = cap.retrieve()
                 if not ok:
                     continue
-
-                # Flip for mirror view
-                frame = cv2.flip(frame, 1)
-                rgb   = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-
-                # Create MediaPipe image
-                mp_image = MpImage(image_format=ImageFormat.SRGB, data=rgb)
-                timestamp_ms = int(time.monotonic() * 1000) + frame_idx
-                frame_idx += 1
-
-                detection = landmarker.detect_for_video(mp_image, timestamp_ms)
-
-                if detection.hand_landmarks:
-                    for hand_lm_list, hand_info_list in zip(
-                        detection.hand_landmarks,
-                        detection.handedness,
-                    ):
-                        # Draw landmarks on the preview frame
-                        h, w = frame.shape[:2]
-                        for conn_start, conn_end in _HAND_CONNECTIONS:
-                            s = hand_lm_list[conn_start]
-                            e = hand_lm_list[conn_end]
-                            cv2.line(frame,
-                                     (int(s.x * w), int(s.y * h)),
-                                     (int(e.x * w), int(e.y * h)),
-                                     (0, 255, 0), 2)
-                        for lm in hand_lm_list:
-                            cv2.circle(frame,
-                                       (int(lm.x * w), int(lm.y * h)),
-                                       4, (0, 0, 255), -1)
-
-                        lm_list = [
-                            Landmark(lm.x, lm.y, lm.z)
-                            for lm in hand_lm_list
-                        ]
-                        handedness = (
-                            hand_info_list[0].category_name
-                            if hand_info_list else "Right"
-                        )
-                        result = HandResult(
-                            landmarks=lm_list,
-                            handedness=handedness,
-                        )
-
-                        try:
-                            self.out_q.put_nowait(result)
-                        except queue.Full:
-                            try:
-                                self.out_q.get_nowait()
-                            except queue.Empty:
-                                pass
-                            self.out_q.put_nowait(result)
-
-                with self._frame_lock:
-                    self._latest_frame = frame.copy()
+                last_infer_t = now
+
+                if self._buffers is None:
+                    # Three slots: one published, one in flight with the
+                    # landmarker, one being written by the capture loop.
+                    self._buffers = [np.empty_like(frame) for _ in range(3)]
+                    self._rgb_buf = np.empty_like(frame)
+
+                # Flip for mirror view and convert to RGB, both into
+                # preallocated buffers — no per-frame ~900KB allocations,
+                # and the working set stays cache-resident.
+                idx  = self._next_write_idx()
+                back = self._buffers[idx]
+                cv2.flip(frame, 1, dst=back)
+                cv2.cvtColor(back, cv2.COLOR_BGR2RGB, dst=self._rgb_buf)
+
+                # Create MediaPipe image (copies the RGB data internally)
+                mp_image = MpImage(image_format=ImageFormat.SRGB, data=self._rgb_buf)
+                # MediaPipe only needs strictly increasing timestamps;
+                # a plain ms-like counter avoids the per-frame clock read
+                # and float→int conversion.
+                timestamp_ms = frame_idx
+                frame_idx += 1000 // 60
+
+                # Keep the source frame addressable until the async result
+                # for this timestamp comes back, then hand off to MediaPipe.
+                with self._pending_lock:
+                    self._pending[timestamp_ms] = idx
+                landmarker.detect_async(mp_image, timestamp_ms)
 
         cap.release()
 
+    def _next_write_idx(self) -> int:
+        """Pick a buffer slot that is neither published nor in flight."""
+        with self._pending_lock:
+            busy = set(self._pending.values())
+            busy.add(self._pub_idx)
+            for i in range(len(self._buffers)):
+                if i not in busy:
+                    return i
+            # All slots busy (stale in-flight entry): reclaim the oldest.
+            # Holding the lock makes the min+pop pair atomic against the
+            # callback's pop, and the branch itself implies _pending is
+            # non-empty (an empty dict would have left a slot free above).
+            oldest = min(self._pending)
+            return self._pending.pop(oldest)
+
+    def _on_result(self, detection, output_image, timestamp_ms: int) -> None:
+        """LIVE_STREAM callback: runs on a MediaPipe worker thread."""
+        with self._pending_lock:
+            idx = self._pending.pop(timestamp_ms, None)
+        frame = self._buffers[idx] if idx is not None else None
+
+        if detection.hand_landmarks:
+            for hand_lm_list, hand_info_list in zip(
+                detection.hand_landmarks,
+                detection.handedness,
+            ):
+                # Fill the staging buffer in place — no per-landmark
+                # tuple/Landmark objects in the hot path.
+                scratch = self._lm_scratch
+                for i, lm in enumerate(hand_lm_list):
+                    scratch[i, 0] = lm.x
+                    scratch[i, 1] = lm.y
+                    scratch[i, 2] = lm.z
+                lm_arr = scratch.copy()
+
+                # Draw landmarks on the preview frame.  Pixel
+                # coordinates come from one vectorized pass and the
+                # whole skeleton is a single polylines call instead
+                # of 21 cv2.line crossings.
+                if self.preview_enabled and frame is not None:
+                    h, w = frame.shape[:2]
+                    pts = (lm_arr[:, :2] * (w, h)).astype(np.int32)
+                    cv2.polylines(frame, list(pts[_CONN_ARR]), False,
+                                  (0, 255, 0), 2)
+                    for x, y in pts.tolist():
+                        cv2.circle(frame, (x, y), 4, (0, 0, 255), -1)
+                handedness = (
+                    hand_info_list[0].category_name
+                    if hand_info_list else "Right"
+                )
+                result = HandResult(
+                    landmarks=lm_arr,
+                    handedness=handedness,
+                    timestamp_ms=timestamp_ms,
+                )
+
+                # Newest result wins: an unconsumed older one is stale
+                with self._result_lock:
+                    self._latest_result = result
+                self._result_ev.set()
+
+        # Publish the freshly annotated buffer: a pure index swap under
+        # the lock.  Headless runs never read latest_frame().
+        if self.preview_enabled and idx is not None:
+            with self._frame_lock:
+                self._pub_idx = idx
+
 
 # Minimal hand connection pairs for drawing (subset of the 21-point skeleton)
-_HAND_CONNECTIONS = [
+_HAND_CONNECTIONS = (
     (0, 1), (1, 2), (2, 3), (3, 4),           # thumb
     (0, 5), (5, 6), (6, 7), (7, 8),            # index
     (5, 9), (9, 10), (10, 11), (11, 12),       # middle
     (9, 13), (13, 14), (14, 15), (15, 16),     # ring
     (13, 17), (17, 18), (18, 19), (19, 20),    # pinky
     (0, 17),                                   # palm base
-]
+)
+
+# (N, 2) index array so `pts[_CONN_ARR]` gathers every connection segment
+# in one shot for the vectorized drawing path.
+_CONN_ARR = np.asarray(_HAND_CONNECTIONS, dtype=np.int32)
+_CONN_ARR.setflags(write=False)
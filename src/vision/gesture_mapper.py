@@ -23,12 +23,20 @@ Supported Gestures  (highest → lowest priority)
 
 from __future__ import annotations
 
-import math
+import sys
 import time
 from dataclasses import dataclass, field
-from typing import List, Optional
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    from scipy.signal import lfilter
+except ImportError:          # optional accelerator for map_batch
+    lfilter = None
 
 from .gesture_detector import HandResult, LM
+from ._landmark_kernels import njit
 
 
 # ---- Tunable thresholds -------------------------------------------------------
@@ -42,18 +50,171 @@ STICK_SMOOTHING        = 0.35    # EWM alpha for gamepad stick
 STICK_DEADZONE         = 0.08    # normalised dead-zone radius around centre
 CONFIRM_FRAMES         = 3       # consecutive frames before a gesture activates
 
+# Full int16 range per unit of normalised deflection, folded to a single
+# constant so the hot path never multiplies 2*32767 at runtime
+_STICK_SCALE           = 2 * 32767
 
-# ---- Gesture identifiers (used for frame-count confirmation) ------------------
+# Dead-zone geometry folded to constants: the in-zone test compares
+# squared magnitudes (no sqrt at rest) and the rescale needs one
+# multiply instead of a division by the zone width
+_DZ_SQ                 = STICK_DEADZONE * STICK_DEADZONE
+_INV_RANGE             = 1.0 / (0.5 - STICK_DEADZONE)
 
-_G_IDLE          = "idle"
-_G_POINTER       = "pointer"
-_G_PINCH         = "pinch"
-_G_V_SIGN        = "v_sign"
-_G_FIST          = "fist"
-_G_OPEN_PALM     = "open_palm"
-_G_SCROLL_UP     = "scroll_up"
-_G_SCROLL_DOWN   = "scroll_down"
-_G_THREE_STICK   = "three_stick"
+
+@njit(cache=True, fastmath=True)
+def _stick_kernel(ix: float, iy: float, prev_sx: float, prev_sy: float):
+    """
+    Fused dead-zone / rescale / smooth / int16-map math for the gamepad
+    stick — tight scalar float work, JIT-compiled when numba is present.
+
+    Returns ``(sx_i, sy_i, new_sx, new_sy, raw_x, raw_y)``: the int16
+    command values, the updated smoothing state, and the dead-zoned raw
+    offsets (used by the batch smoother, which applies the recurrence
+    itself).
+    """
+    raw_x = ix - 0.5
+    raw_y = iy - 0.5
+
+    mag_sq = raw_x * raw_x + raw_y * raw_y
+    if mag_sq < _DZ_SQ:
+        # Inside the dead zone (the at-rest common case): no sqrt at all
+        raw_x = 0.0
+        raw_y = 0.0
+    else:
+        # Re-scale so edge of dead-zone maps to 0
+        mag = mag_sq ** 0.5
+        scale = (mag - STICK_DEADZONE) * _INV_RANGE / mag
+        raw_x *= scale
+        raw_y *= scale
+
+    new_sx = prev_sx * (1 - STICK_SMOOTHING) + raw_x * STICK_SMOOTHING
+    new_sy = prev_sy * (1 - STICK_SMOOTHING) + raw_y * STICK_SMOOTHING
+
+    # Half-away-from-zero rounding plus a conditional-expression clamp:
+    # no round() builtin or min/max calls on the per-frame path
+    vx = new_sx * _STICK_SCALE
+    vy = new_sy * _STICK_SCALE
+    sx_i = int(vx + 0.5) if vx >= 0.0 else int(vx - 0.5)
+    sy_i = int(vy + 0.5) if vy >= 0.0 else int(vy - 0.5)
+    sx_i = -32767 if sx_i < -32767 else (32767 if sx_i > 32767 else sx_i)
+    sy_i = -32767 if sy_i < -32767 else (32767 if sy_i > 32767 else sy_i)
+    return sx_i, sy_i, new_sx, new_sy, raw_x, raw_y
+
+
+# ---- Gesture identifiers (used for frame-count confirmation) ------------------
+# Small ints rather than strings so the confirm/cooldown state machine
+# can run as a nopython kernel; labels exist only at the HUD boundary.
+
+_G_IDLE          = 0
+_G_POINTER       = 1
+_G_PINCH         = 2
+_G_V_SIGN        = 3
+_G_FIST          = 4
+_G_OPEN_PALM     = 5
+_G_SCROLL_UP     = 6
+_G_SCROLL_DOWN   = 7
+_G_THREE_STICK   = 8
+
+# Shared empty result: idle frames return this singleton instead of
+# allocating a fresh container at 60 Hz.
+_EMPTY: Tuple[str, ...] = ()
+
+# Fixed command strings, interned once: appends become reference copies
+# and downstream consumers can compare with ``is``.
+_CMD_MOUSE_LEFT  = sys.intern("MOUSE_LEFT")
+_CMD_MOUSE_RIGHT = sys.intern("MOUSE_RIGHT")
+_CMD_BTN_A_DOWN  = sys.intern("GAMEPAD_BTN A 1")
+_CMD_BTN_A_UP    = sys.intern("GAMEPAD_BTN A 0")
+_CMD_START_DOWN  = sys.intern("GAMEPAD_BTN START 1")
+_CMD_START_UP    = sys.intern("GAMEPAD_BTN START 0")
+_CMD_SCROLL_UP   = sys.intern("MOUSE_SCROLL 3")
+_CMD_SCROLL_DOWN = sys.intern("MOUSE_SCROLL -3")
+
+# Human-friendly HUD labels for each gesture — computed here so the HUD
+# can reuse the mapper's classification instead of re-deriving finger
+# state and pinch distance from the same landmarks.
+_GESTURE_LABELS = {
+    _G_IDLE:        "Idle",
+    _G_POINTER:     "Point  (Mouse Move)",
+    _G_PINCH:       "Pinch  (Hold)",
+    _G_V_SIGN:      "V-Sign",
+    _G_FIST:        "Fist  (Btn A Hold)",
+    _G_OPEN_PALM:   "Open Palm",
+    _G_SCROLL_UP:   "Thumb+Index  (Scroll)",
+    _G_SCROLL_DOWN: "Thumb+Index  (Scroll)",
+    _G_THREE_STICK: "Three Fingers",
+}
+
+
+# Emit flags returned by _step: each bit tells map() which command
+# block to format for this frame.
+_EMIT_RELEASE_A = 1
+_EMIT_POINTER   = 2
+_EMIT_CLICK     = 4
+_EMIT_BTN_A     = 8
+_EMIT_RCLICK    = 16
+_EMIT_STICK     = 32
+_EMIT_START     = 64
+_EMIT_SCROLL    = 128
+
+
+@njit(cache=True)
+def _step(gesture: int, pending: int, pending_count: int, active: int,
+          fist_held: bool, pinching: bool, now: float,
+          last_click_t: float, last_rclick_t: float,
+          last_scroll_t: float, last_start_t: float):
+    """
+    Fused confirm-frame / hold-release / cooldown state machine for one
+    frame — pure scalar int/float branching, JIT-compiled when numba is
+    present.  Returns the updated state fields plus an emit-flags int;
+    :meth:`GestureMapper.map` only formats strings for the set bits.
+    """
+    if gesture == pending:
+        pending_count += 1
+    else:
+        pending = gesture
+        pending_count = 1
+    if pending_count >= CONFIRM_FRAMES:
+        active = gesture
+
+    flags = 0
+    if active != _G_FIST and fist_held:
+        flags |= _EMIT_RELEASE_A
+        fist_held = False
+    if active != _G_PINCH and pinching:
+        pinching = False
+
+    if active == _G_POINTER:
+        flags |= _EMIT_POINTER
+    elif active == _G_PINCH:
+        flags |= _EMIT_POINTER                 # keep cursor tracking
+        if not pinching:
+            pinching = True
+            if (now - last_click_t) > CLICK_COOLDOWN_S:
+                flags |= _EMIT_CLICK
+                last_click_t = now
+    elif active == _G_FIST:
+        if not fist_held:
+            flags |= _EMIT_BTN_A
+            fist_held = True
+    elif active == _G_V_SIGN:
+        flags |= _EMIT_POINTER                 # cursor tracks index
+        if (now - last_rclick_t) > CLICK_COOLDOWN_S:
+            flags |= _EMIT_RCLICK
+            last_rclick_t = now
+    elif active == _G_OPEN_PALM:
+        if (now - last_start_t) > 1.0:
+            flags |= _EMIT_START
+            last_start_t = now
+    elif active == _G_THREE_STICK:
+        flags |= _EMIT_STICK
+    elif active == _G_SCROLL_UP or active == _G_SCROLL_DOWN:
+        if (now - last_scroll_t) > SCROLL_COOLDOWN_S:
+            flags |= _EMIT_SCROLL
+            last_scroll_t = now
+
+    return (pending, pending_count, active, fist_held, pinching,
+            last_click_t, last_rclick_t, last_scroll_t, last_start_t, flags)
 
 
 @dataclass
@@ -70,54 +231,53 @@ class _MappingState:
     # Gamepad hold states
     fist_held: bool = False
     # Gesture confirmation counter
-    pending_gesture: str = _G_IDLE
+    pending_gesture: int = _G_IDLE
     pending_count: int = 0
-    active_gesture: str  = _G_IDLE
-    # Cooldown timestamps (far in the past so first event fires immediately)
-    last_click_t: float  = field(default_factory=lambda: time.monotonic() - 10.0)
-    last_rclick_t: float = field(default_factory=lambda: time.monotonic() - 10.0)
-    last_scroll_t: float = field(default_factory=lambda: time.monotonic() - 10.0)
-    last_start_t: float  = field(default_factory=lambda: time.monotonic() - 10.0)
-
-
-def _classify(hand: HandResult) -> str:
-    """Classify a single frame into one gesture label (priority ladder)."""
-    ext = [hand.finger_extended(i) for i in range(5)]
-    n   = sum(ext)
-
+    active_gesture: int  = _G_IDLE
+    # Cooldown timestamps (far in the past so first event fires immediately;
+    # plain sentinel, no per-construction clock read or closure)
+    last_click_t: float  = -1e9
+    last_rclick_t: float = -1e9
+    last_scroll_t: float = -1e9
+    last_start_t: float  = -1e9
+
+
+# Exact finger-extension bitmasks (bit 0 = thumb … bit 4 = pinky) mapped
+# straight to their gesture — one hash lookup replaces the branch ladder.
+# Masks not listed here fall through to the scroll/pointer checks below.
+_MASK_DISPATCH = {
+    0b00000: _G_FIST,          # no fingers
+    0b00110: _G_V_SIGN,        # index + middle only
+    0b01110: _G_THREE_STICK,   # index + middle + ring only
+    0b11111: _G_OPEN_PALM,     # all five
+}
+
+
+def _classify(hand: HandResult) -> int:
+    """Classify a single frame into one gesture id (priority ladder)."""
     # --- Pinch (thumb + index tips close) – highest priority ----------------
     if hand.pinch_distance() < PINCH_CLOSE_THRESHOLD:
         return _G_PINCH
 
-    # --- Fist (no fingers extended) -----------------------------------------
-    if n == 0:
-        return _G_FIST
-
-    # --- V-sign (index + middle only) ---------------------------------------
-    if ext[1] and ext[2] and not ext[0] and not ext[3] and not ext[4]:
-        return _G_V_SIGN
-
-    # --- Three-finger stick (index + middle + ring, no thumb/pinky) ---------
-    if ext[1] and ext[2] and ext[3] and not ext[0] and not ext[4]:
-        return _G_THREE_STICK
-
-    # --- Open palm (all 5) --------------------------------------------------
-    if n == 5:
-        return _G_OPEN_PALM
-
-    # --- Thumb + index = scroll (direction determined later) ----------------
-    if ext[0] and ext[1] and n == 2:
-        thumb = hand.fingertip(0)
-        wrist = hand.lm(LM.WRIST)
-        if thumb.y < wrist.y - 0.04:
+    mask = hand.extended_bits()
+    gesture = _MASK_DISPATCH.get(mask)
+    if gesture is not None:
+        return gesture
+
+    # --- Thumb + index = scroll (direction from thumb vs wrist) -------------
+    if mask == 0b00011:
+        a = hand.landmarks
+        thumb_y = a[LM.THUMB_TIP, 1]
+        wrist_y = a[LM.WRIST, 1]
+        if thumb_y < wrist_y - 0.04:
             return _G_SCROLL_UP
-        elif thumb.y > wrist.y + 0.04:
+        elif thumb_y > wrist_y + 0.04:
             return _G_SCROLL_DOWN
         # Ambiguous direction → treat as pointer
         return _G_POINTER
 
     # --- Pointer (index extended, regardless of other fingers) ---------------
-    if ext[1]:
+    if mask & 0b00010:
         return _G_POINTER
 
     return _G_IDLE
@@ -137,127 +297,199 @@ class GestureMapper:
         self.screen_w = screen_w
         self.screen_h = screen_h
         self._state = _MappingState()
-
-    def map(self, hand: HandResult) -> List[str]:
+        # Sample accumulators active only inside map_batch(): when set,
+        # _do_pointer/_do_stick record their input and leave a placeholder
+        # so the EWMA recurrence can run once over the whole batch.
+        self._batch_moves: Optional[list] = None
+        self._batch_sticks: Optional[list] = None
+
+    @property
+    def active_gesture_label(self) -> str:
+        """HUD label for the currently confirmed gesture (after :meth:`map`)."""
+        return _GESTURE_LABELS[self._state.active_gesture]
+
+    def map(self, hand: HandResult, now: Optional[float] = None) -> Sequence[str]:
         """
-        Convert a single HandResult into a (possibly empty) list of
-        driver command strings.
+        Convert a single HandResult into a (possibly empty) sequence of
+        driver command strings.  Idle frames return a shared empty tuple
+        and single-command frames a one-element tuple, so the common
+        cases allocate at most once.
+
+        *now* lets the pipeline driver snapshot ``time.monotonic()`` once
+        per iteration and share it across mapper and HUD; omitted, it is
+        read here.
         """
-        commands: List[str] = []
-        now = time.monotonic()
-        s   = self._state
+        if now is None:
+            now = time.monotonic()
+        s = self._state
 
-        # ── 1. Classify this frame ───────────────────────────────────────
+        # ── 1. Classify, confirm, gate cooldowns — one fused kernel ──────
         gesture = _classify(hand)
+        (s.pending_gesture, s.pending_count, s.active_gesture, s.fist_held,
+         s.pinching, s.last_click_t, s.last_rclick_t, s.last_scroll_t,
+         s.last_start_t, flags) = _step(
+            gesture, s.pending_gesture, s.pending_count, s.active_gesture,
+            s.fist_held, s.pinching, now, s.last_click_t, s.last_rclick_t,
+            s.last_scroll_t, s.last_start_t,
+        )
+
+        # ── 2. Format commands for the emit bits ─────────────────────────
+        if flags == 0:
+            return _EMPTY
+
+        commands: Tuple[str, ...] = _EMPTY
+        # The kernel only ever sets mutually compatible bits, so pointer
+        # builds the base tuple and click/rclick append to it; the
+        # remaining blocks are exclusive and assign outright.
+        if flags & _EMIT_POINTER:
+            commands = self._do_pointer(hand)
+        if flags & _EMIT_CLICK:
+            commands += (_CMD_MOUSE_LEFT,)
+        elif flags & _EMIT_RCLICK:
+            commands += (_CMD_MOUSE_RIGHT,)
+        elif flags & _EMIT_BTN_A:
+            commands = (_CMD_BTN_A_DOWN,)
+        elif flags & _EMIT_STICK:
+            commands = self._do_stick(hand)
+        elif flags & _EMIT_START:
+            commands = (_CMD_START_DOWN, _CMD_START_UP)
+        elif flags & _EMIT_SCROLL:
+            commands = ((_CMD_SCROLL_UP,)
+                        if s.active_gesture == _G_SCROLL_UP
+                        else (_CMD_SCROLL_DOWN,))
+
+        if flags & _EMIT_RELEASE_A:
+            return (_CMD_BTN_A_UP,) + commands
+        return commands
 
-        # ── 2. Confirm: require N consecutive frames of the same gesture ─
-        if gesture == s.pending_gesture:
-            s.pending_count += 1
-        else:
-            s.pending_gesture = gesture
-            s.pending_count   = 1
-
-        confirmed = s.pending_count >= CONFIRM_FRAMES
-        if confirmed:
-            s.active_gesture = gesture
-
-        active = s.active_gesture
-
-        # ── 3. Release held state when gesture changes ───────────────────
-        if active != _G_FIST and s.fist_held:
-            commands.append("GAMEPAD_BTN A 0")
-            s.fist_held = False
-
-        if active != _G_PINCH and s.pinching:
-            s.pinching = False
-
-        # ── 4. Execute the active gesture ────────────────────────────────
-
-        # --- Pointer (mouse move) ----------------------------------------
-        if active == _G_POINTER:
-            commands.extend(self._do_pointer(hand))
-
-        # --- Pinch (left click) ------------------------------------------
-        elif active == _G_PINCH:
-            commands.extend(self._do_pointer(hand))   # keep cursor tracking
-            if not s.pinching:
-                s.pinching = True
-                if (now - s.last_click_t) > CLICK_COOLDOWN_S:
-                    commands.append("MOUSE_LEFT")
-                    s.last_click_t = now
-
-        # --- Fist (gamepad A hold) ---------------------------------------
-        elif active == _G_FIST:
-            if not s.fist_held:
-                commands.append("GAMEPAD_BTN A 1")
-                s.fist_held = True
-
-        # --- V-sign (right click, one-shot per cooldown) -----------------
-        elif active == _G_V_SIGN:
-            commands.extend(self._do_pointer(hand))   # cursor tracks index
-            if (now - s.last_rclick_t) > CLICK_COOLDOWN_S:
-                commands.append("MOUSE_RIGHT")
-                s.last_rclick_t = now
-
-        # --- Three-finger stick ------------------------------------------
-        elif active == _G_THREE_STICK:
-            commands.extend(self._do_stick(hand))
-
-        # --- Open palm → START (one-shot) --------------------------------
-        elif active == _G_OPEN_PALM:
-            if (now - s.last_start_t) > 1.0:
-                commands.append("GAMEPAD_BTN START 1")
-                commands.append("GAMEPAD_BTN START 0")
-                s.last_start_t = now
-
-        # --- Scroll (thumb + index) --------------------------------------
-        elif active in (_G_SCROLL_UP, _G_SCROLL_DOWN):
-            delta = 3 if active == _G_SCROLL_UP else -3
-            if (now - s.last_scroll_t) > SCROLL_COOLDOWN_S:
-                commands.append(f"MOUSE_SCROLL {delta}")
-                s.last_scroll_t = now
+    def map_into(self, hand: HandResult, out: List[str],
+                 now: Optional[float] = None) -> List[str]:
+        """
+        Like :meth:`map`, but extends the caller-owned *out* list instead
+        of handing back a fresh container — for tight loops that keep one
+        buffer alive across frames (clear it between reads as needed).
+        Returns *out*.
+        """
+        cmds = self.map(hand, now)
+        if cmds:
+            out.extend(cmds)
+        return out
 
-        return commands
+    def map_batch(self, hands) -> List[Sequence[str]]:
+        """
+        Map a batch of HandResults (e.g. queued frames from the async
+        detector) and return one command list per frame.  A stacked
+        ``(B, 21, 3)`` landmark array is also accepted; each row is
+        wrapped as a right-hand HandResult.
+
+        Output is identical to calling :meth:`map` per frame, but the
+        pointer/stick EWMA recurrences run as a single vectorized
+        ``scipy.signal.lfilter`` sweep over the batch instead of one
+        Python update per frame.  Falls back to the per-frame path when
+        scipy is not installed.
+        """
+        if isinstance(hands, np.ndarray):
+            hands = [HandResult(landmarks=row, handedness="Right")
+                     for row in hands]
+        if lfilter is None:
+            now = time.monotonic()
+            return [self.map(h, now) for h in hands]
+
+        self._batch_moves  = []
+        self._batch_sticks = []
+        now = time.monotonic()
+        try:
+            frames = [self.map(h, now) for h in hands]
+            self._flush_move_batch(frames)
+            self._flush_stick_batch(frames)
+        finally:
+            self._batch_moves = self._batch_sticks = None
+        return frames
 
     # ── Helpers ──────────────────────────────────────────────────────────────
 
-    def _do_pointer(self, hand: HandResult) -> List[str]:
+    # Placeholders left in a frame's command list during map_batch until
+    # the batched smoother fills in the real command.
+    _MOVE_PENDING  = "\0MOVE"
+    _STICK_PENDING = "\0STICK"
+
+    def _flush_move_batch(self, frames: List[Sequence[str]]) -> None:
+        moves = self._batch_moves
+        if not moves:
+            return
+        s  = self._state
+        a  = SCREEN_SMOOTHING
+        xy = np.asarray(moves)
+        sx, _ = lfilter([a], [1.0, -(1.0 - a)], xy[:, 0], zi=[s.prev_x * (1 - a)])
+        sy, _ = lfilter([a], [1.0, -(1.0 - a)], xy[:, 1], zi=[s.prev_y * (1 - a)])
+        s.prev_x, s.prev_y = float(sx[-1]), float(sy[-1])
+
+        px = np.clip(np.rint(sx * self.screen_w), 0, self.screen_w - 1)
+        py = np.clip(np.rint(sy * self.screen_h), 0, self.screen_h - 1)
+        cmds = iter(["MOUSE_MOVE %d %d" % (x, y) for x, y in zip(px, py)])
+        self._replace_pending(frames, self._MOVE_PENDING, cmds)
+
+    def _flush_stick_batch(self, frames: List[Sequence[str]]) -> None:
+        sticks = self._batch_sticks
+        if not sticks:
+            return
+        s  = self._state
+        a  = STICK_SMOOTHING
+        xy = np.asarray(sticks)
+        sx, _ = lfilter([a], [1.0, -(1.0 - a)], xy[:, 0], zi=[s.stick_x * (1 - a)])
+        sy, _ = lfilter([a], [1.0, -(1.0 - a)], xy[:, 1], zi=[s.stick_y * (1 - a)])
+        s.stick_x, s.stick_y = float(sx[-1]), float(sy[-1])
+
+        vx = np.clip(np.rint(sx * _STICK_SCALE), -32767, 32767)
+        vy = np.clip(np.rint(sy * _STICK_SCALE), -32767, 32767)
+        cmds = iter(["GAMEPAD_STICK %d %d" % (x, y) for x, y in zip(vx, vy)])
+        self._replace_pending(frames, self._STICK_PENDING, cmds)
+
+    @staticmethod
+    def _replace_pending(frames, placeholder, cmds) -> None:
+        for fi, frame_cmds in enumerate(frames):
+            if placeholder in frame_cmds:
+                frames[fi] = tuple(next(cmds) if c is placeholder else c
+                                   for c in frame_cmds)
+
+    def _do_pointer(self, hand: HandResult) -> Tuple[str, ...]:
         """Smoothed cursor movement from index fingertip."""
         s = self._state
         ix, iy = hand.index_tip_position()
 
+        if self._batch_moves is not None:
+            # Defer: the batch smoother applies the same recurrence in bulk
+            self._batch_moves.append((ix, iy))
+            return (self._MOVE_PENDING,)
+
         sx = s.prev_x * (1 - SCREEN_SMOOTHING) + ix * SCREEN_SMOOTHING
         sy = s.prev_y * (1 - SCREEN_SMOOTHING) + iy * SCREEN_SMOOTHING
         s.prev_x, s.prev_y = sx, sy
 
-        px = max(0, min(round(sx * self.screen_w), self.screen_w - 1))
-        py = max(0, min(round(sy * self.screen_h), self.screen_h - 1))
-        return [f"MOUSE_MOVE {px} {py}"]
-
-    def _do_stick(self, hand: HandResult) -> List[str]:
+        # Conditional-expression clamp: compare+jump bytecode instead of
+        # two builtin calls per axis (in-range is the overwhelmingly
+        # common case and costs just the comparison)
+        px = round(sx * self.screen_w)
+        py = round(sy * self.screen_h)
+        px = px if 0 <= px < self.screen_w else (0 if px < 0 else self.screen_w - 1)
+        py = py if 0 <= py < self.screen_h else (0 if py < 0 else self.screen_h - 1)
+        # %-formatting skips the __format__ protocol — the CPython fast
+        # path for small-int substitution on this per-frame string
+        return ("MOUSE_MOVE %d %d" % (px, py),)
+
+    def _do_stick(self, hand: HandResult) -> Tuple[str, ...]:
         """Smoothed analogue stick from index fingertip with dead-zone."""
         s = self._state
         ix, iy = hand.index_tip_position()
 
-        # Raw normalised offset from centre (−0.5 … +0.5)
-        raw_x = ix - 0.5
-        raw_y = iy - 0.5
-
-        # Apply dead-zone
-        mag = math.hypot(raw_x, raw_y)
-        if mag < STICK_DEADZONE:
-            raw_x, raw_y = 0.0, 0.0
-        else:
-            # Re-scale so edge of dead-zone maps to 0
-            scale = (mag - STICK_DEADZONE) / (0.5 - STICK_DEADZONE) / mag
-            raw_x *= scale
-            raw_y *= scale
-
-        # Smooth
-        s.stick_x = s.stick_x * (1 - STICK_SMOOTHING) + raw_x * STICK_SMOOTHING
-        s.stick_y = s.stick_y * (1 - STICK_SMOOTHING) + raw_y * STICK_SMOOTHING
-
-        # Map to int16 range
-        sx = max(-32767, min(32767, round(s.stick_x * 2 * 32767)))
-        sy = max(-32767, min(32767, round(s.stick_y * 2 * 32767)))
-        return [f"GAMEPAD_STICK {sx} {sy}"]
+        sx, sy, new_sx, new_sy, raw_x, raw_y = _stick_kernel(
+            ix, iy, s.stick_x, s.stick_y
+        )
+
+        if self._batch_sticks is not None:
+            # Defer: the batch smoother applies the same recurrence in bulk
+            self._batch_sticks.append((raw_x, raw_y))
+            return (self._STICK_PENDING,)
+
+        s.stick_x, s.stick_y = new_sx, new_sy
+        return ("GAMEPAD_STICK %d %d" % (sx, sy),)
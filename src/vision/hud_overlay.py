@@ -10,9 +10,8 @@ Draws a translucent panel on the camera frame showing:
 
 from __future__ import annotations
 
-import collections
 import time
-from typing import List, Optional
+from typing import Optional, Sequence
 
 import cv2
 import numpy as np
@@ -29,38 +28,65 @@ _CYAN    = (255, 220, 0)
 _GREY    = (180, 180, 180)
 _BG      = (30, 30, 30)
 
+# Command-log fade colours (yellow → grey), precomputed for 17 alpha
+# buckets so the per-line colour is a table lookup instead of three
+# float multiplies and a tuple allocation.
+_FADE_LUT = tuple(
+    tuple(int(c * (i / 16) + g * (1 - i / 16)) for c, g in zip(_YELLOW, (100, 100, 100)))
+    for i in range(17)
+)
+
 _FONT       = cv2.FONT_HERSHEY_SIMPLEX
 _FONT_BOLD  = cv2.FONT_HERSHEY_DUPLEX
 
 _FINGER_LABELS = ["Thumb", "Index", "Middle", "Ring", "Pinky"]
 
 
-def classify_gesture(hand: Optional[HandResult], cmds: List[str]) -> str:
+def _scroll_label(cmd: str) -> str:
+    return "Scroll Up" if int(cmd.split()[-1]) > 0 else "Scroll Down"
+
+
+# Command → label dispatch tables: one hash lookup per command instead
+# of a chain of startswith/equality tests. Exact-match commands first,
+# then parameterized ones keyed on the protocol verb (first token).
+_CMD_TO_LABEL = {
+    "MOUSE_LEFT": "Pinch  (Left Click)",
+    "MOUSE_RIGHT": "V-Sign  (Right Click)",
+    "GAMEPAD_BTN START 1": "Open Palm  (Start)",
+    "GAMEPAD_BTN A 1": "Fist  (Btn A Press)",
+    "GAMEPAD_BTN A 0": "Fist Released",
+}
+_PREFIX_TO_LABEL = {
+    "MOUSE_SCROLL": _scroll_label,
+    "GAMEPAD_STICK": lambda cmd: "Three Fingers  (Stick)",
+}
+
+
+def _label_from_cmds(cmds: Sequence[str]) -> Optional[str]:
+    """Label derived from the commands that actually fired this frame."""
+    for c in cmds:
+        label = _CMD_TO_LABEL.get(c)
+        if label is not None:
+            return label
+        fn = _PREFIX_TO_LABEL.get(c.split(" ", 1)[0])
+        if fn is not None:
+            return fn(c)
+    return None
+
+
+def classify_gesture(hand: Optional[HandResult], cmds: Sequence[str]) -> str:
     """Return a human-friendly gesture name based on hand state & commands."""
     if hand is None:
         return "No Hand"
 
-    # Derive label from the commands that actually fired this frame
-    for c in cmds:
-        if c == "MOUSE_LEFT":
-            return "Pinch  (Left Click)"
-        if c == "MOUSE_RIGHT":
-            return "V-Sign  (Right Click)"
-        if c.startswith("MOUSE_SCROLL"):
-            val = c.split()[-1]
-            return "Scroll Up" if int(val) > 0 else "Scroll Down"
-        if c.startswith("GAMEPAD_STICK"):
-            return "Three Fingers  (Stick)"
-        if "GAMEPAD_BTN START 1" in c:
-            return "Open Palm  (Start)"
-        if "GAMEPAD_BTN A 1" in c:
-            return "Fist  (Btn A Press)"
-        if "GAMEPAD_BTN A 0" in c:
-            return "Fist Released"
-
-    # No special command → infer from finger state
-    ext = [hand.finger_extended(i) for i in range(5)]
-    n = sum(ext)
+    label = _label_from_cmds(cmds)
+    if label is not None:
+        return label
+
+    # No special command → infer from finger state (one vectorized mask
+    # read instead of five per-finger calls)
+    ext = hand.extended_mask()
+    n = int(ext.sum())
 
     if hand.pinch_distance() < 0.05:
         return "Pinch  (Hold)"
@@ -89,102 +115,197 @@ class HudOverlay:
     CMD_LOG_SIZE = 6
 
     def __init__(self) -> None:
-        self._cmd_log: collections.deque[tuple[float, str]] = collections.deque(
-            maxlen=self.CMD_LOG_SIZE
-        )
-        self._fps_ts: collections.deque[float] = collections.deque(maxlen=60)
+        # Command log as a fixed ring (timestamps + texts + write head)
+        # instead of a deque, so draw() iterates newest-first without
+        # materializing and reversing a list every frame.
+        self._cmd_ts = np.full(self.CMD_LOG_SIZE, -1e9)
+        self._cmd_txt: list[str] = [""] * self.CMD_LOG_SIZE
+        self._cmd_head = 0
+        # FPS as an exponential moving average of the frame period:
+        # O(1) state, no timestamp deque to maintain per frame.
+        self._frame_period_ewm: float = 0.0
+        self._last_ts: float = 0.0
         self._gesture_name: str = "Waiting…"
         self._finger_state: list[bool] = [False] * 5
+        # Finger indicator geometry never changes — precompute the circle
+        # centres, initial glyphs and their text anchors once.
+        self._finger_centers = tuple((30 + i * 52, 127) for i in range(5))
+        self._finger_initial_pos = tuple((25 + i * 52, 132) for i in range(5))
+        self._finger_initials = tuple(l[0] for l in _FINGER_LABELS)
+        # Render the HUD every K-th draw call: mapping runs at full rate
+        # while the overlay refreshes at e.g. 30 Hz, below which humans
+        # don't notice — skipped calls return the previous rendered frame.
+        self._draw_skip = 2
+        self._draw_counter = 0
+        self._last_frame: Optional[np.ndarray] = None
+        # Static chrome (panels + header/label text) pre-rendered once
+        # per frame size and composited per frame; see _ensure_chrome.
+        self._chrome_key: Optional[tuple[int, int]] = None
+        self._chrome_rois: list[tuple[int, int, np.ndarray, np.ndarray]] = []
 
     # ── Public API ───────────────────────────────────────────────────────────
 
     def update(
         self,
         hand: Optional[HandResult],
-        cmds: List[str],
+        cmds: Sequence[str],
+        now: Optional[float] = None,
+        gesture: Optional[str] = None,
     ) -> None:
-        """Feed new frame data (call once per loop iteration)."""
-        now = time.monotonic()
-        self._fps_ts.append(now)
+        """
+        Feed new frame data (call once per loop iteration).
+
+        *now* lets the caller share one ``time.monotonic()`` snapshot per
+        iteration across mapper and HUD; omitted, it is read here.
+        *gesture* is the mapper's already-computed gesture label
+        (``GestureMapper.active_gesture_label``); when given, the HUD
+        skips re-deriving finger state and pinch distance from the same
+        landmarks.  One-shot events (clicks, scrolls) still override it
+        so they flash on screen.
+        """
+        if now is None:
+            now = time.monotonic()
+        if self._last_ts:
+            dt = now - self._last_ts
+            ewm = self._frame_period_ewm
+            # Seed with the first observed period so the badge doesn't
+            # start from a wildly inflated reading
+            self._frame_period_ewm = 0.9 * ewm + 0.1 * dt if ewm else dt
+        self._last_ts = now
 
         # Gesture label
-        self._gesture_name = classify_gesture(hand, cmds)
+        if gesture is not None and hand is not None:
+            self._gesture_name = _label_from_cmds(cmds) or gesture
+        else:
+            self._gesture_name = classify_gesture(hand, cmds)
 
         # Finger state
         if hand is not None:
-            self._finger_state = [hand.finger_extended(i) for i in range(5)]
+            self._finger_state = hand.extended_mask().tolist()
         else:
             self._finger_state = [False] * 5
 
         # Append non-trivial commands to the scrolling log
         for c in cmds:
             if not c.startswith("MOUSE_MOVE"):  # moves are too spammy
-                self._cmd_log.append((now, c))
-
-    def draw(self, frame: np.ndarray) -> np.ndarray:
-        """Draw the HUD onto *frame* (mutates in place and returns it)."""
+                head = self._cmd_head
+                self._cmd_ts[head] = now
+                self._cmd_txt[head] = c
+                self._cmd_head = (head + 1) % self.CMD_LOG_SIZE
+
+    def set_hud_rate(self, divisor: int) -> None:
+        """Render the HUD on every *divisor*-th draw call (1 = every frame)."""
+        self._draw_skip = max(1, int(divisor))
+
+    def draw(self, frame: np.ndarray, now: Optional[float] = None) -> np.ndarray:
+        """
+        Draw the HUD onto *frame* (mutates in place) and return the frame
+        to display.  On skipped iterations (see :meth:`set_hud_rate`) the
+        previous rendered frame is returned instead, so callers should
+        show the return value rather than their input.
+        """
+        count = self._draw_counter
+        self._draw_counter = count + 1
+        if count % self._draw_skip and self._last_frame is not None:
+            return self._last_frame
+
+        if now is None:
+            now = time.monotonic()
         h, w = frame.shape[:2]
 
-        # ── Left panel (gesture + fingers) ───────────────────────────────
-        panel_w, panel_h = 280, 170
-        self._draw_panel(frame, 10, 10, panel_w, panel_h, alpha=0.65)
+        # ── Static chrome (panels + headers + finger labels) ─────────────
+        self._ensure_chrome(h, w)
+        for x, y, premul, inv_a in self._chrome_rois:
+            ph, pw = premul.shape[:2]
+            roi = frame[y:y + ph, x:x + pw]
+            roi[:] = roi * inv_a + premul
+
+        # Hoist the cv2 attribute lookups out of the per-glyph calls.
+        # Small glyphs render aliased (LINE_8): ~3-5x cheaper to
+        # rasterize and indistinguishable at these sizes — only the large
+        # gesture-name label keeps antialiasing.
+        put_text, circle, font = cv2.putText, cv2.circle, _FONT
+        line8 = cv2.LINE_8
 
-        y0 = 35
         # Gesture name
-        cv2.putText(frame, "GESTURE", (20, y0), _FONT, 0.45, _GREY, 1, cv2.LINE_AA)
-        cv2.putText(frame, self._gesture_name, (20, y0 + 26), _FONT_BOLD, 0.6,
-                    _GREEN, 1, cv2.LINE_AA)
-
-        # Finger indicators
-        cv2.putText(frame, "FINGERS", (20, y0 + 66), _FONT, 0.45, _GREY, 1, cv2.LINE_AA)
-        for i, (label, on) in enumerate(zip(_FINGER_LABELS, self._finger_state)):
-            cx = 30 + i * 52
-            cy = y0 + 92
+        put_text(frame, self._gesture_name, (20, 61), _FONT_BOLD, 0.6,
+                 _GREEN, 1, cv2.LINE_AA)
+
+        # Finger indicators (circle fill + initial are state-coloured)
+        for centre, anchor, initial, on in zip(
+            self._finger_centers, self._finger_initial_pos,
+            self._finger_initials, self._finger_state,
+        ):
             colour = _GREEN if on else _RED
-            cv2.circle(frame, (cx, cy), 10, colour, -1, cv2.LINE_AA)
-            cv2.putText(frame, label[0], (cx - 5, cy + 5), _FONT, 0.4, _WHITE, 1, cv2.LINE_AA)
-            cv2.putText(frame, label, (cx - 15, cy + 26), _FONT, 0.3,
-                        colour, 1, cv2.LINE_AA)
+            circle(frame, centre, 10, colour, -1, line8)
+            put_text(frame, initial, anchor, font, 0.4, _WHITE, 1, line8)
 
         # ── Right panel (command log) ────────────────────────────────────
-        log_w, log_h = 300, 20 + self.CMD_LOG_SIZE * 22
-        lx = w - log_w - 10
-        self._draw_panel(frame, lx, 10, log_w, log_h, alpha=0.65)
-
-        cv2.putText(frame, "HID COMMANDS", (lx + 10, 32), _FONT, 0.45, _GREY, 1, cv2.LINE_AA)
-        now = time.monotonic()
-        for idx, (ts, cmd) in enumerate(reversed(list(self._cmd_log))):
-            age = now - ts
-            alpha_txt = max(0.3, 1.0 - age / 4.0)
-            # Fade colour from yellow → grey
-            col = tuple(int(c * alpha_txt + g * (1 - alpha_txt))
-                        for c, g in zip(_YELLOW, (100, 100, 100)))
+        lx = w - 310
+        for idx in range(self.CMD_LOG_SIZE):
+            j = (self._cmd_head - 1 - idx) % self.CMD_LOG_SIZE
+            cmd = self._cmd_txt[j]
+            if not cmd:  # slot never written
+                break
+            age = now - self._cmd_ts[j]
+            alpha_txt = 1.0 - age / 4.0
+            if alpha_txt < 0.3:
+                alpha_txt = 0.3
+            col = _FADE_LUT[int(alpha_txt * 16)]
             ty = 54 + idx * 22
-            cv2.putText(frame, cmd, (lx + 10, ty), _FONT, 0.42, col, 1, cv2.LINE_AA)
+            put_text(frame, cmd, (lx + 10, ty), font, 0.42, col, 1, line8)
 
         # ── FPS badge (bottom-left) ──────────────────────────────────────
         fps_val = self._calc_fps()
         fps_text = f"FPS: {fps_val:.0f}"
-        cv2.putText(frame, fps_text, (15, h - 15), _FONT, 0.55, _CYAN, 1, cv2.LINE_AA)
+        put_text(frame, fps_text, (15, h - 15), font, 0.55, _CYAN, 1, line8)
 
+        self._last_frame = frame
         return frame
 
     # ── Internals ────────────────────────────────────────────────────────────
 
-    @staticmethod
-    def _draw_panel(
-        frame: np.ndarray, x: int, y: int, w: int, h: int, alpha: float = 0.6
-    ) -> None:
-        """Draw a semi-transparent dark rectangle."""
-        overlay = frame.copy()
-        cv2.rectangle(overlay, (x, y), (x + w, y + h), _BG, -1)
-        cv2.addWeighted(overlay, alpha, frame, 1 - alpha, 0, frame)
+    def _ensure_chrome(self, h: int, w: int) -> None:
+        """(Re)build the pre-rendered static chrome for an ``h×w`` frame.
+
+        Panel backgrounds, section headers and finger name labels never
+        change, so they are rasterized once into an RGBA canvas here;
+        ``draw`` then composites just the two panel regions with a cheap
+        premultiplied blend instead of re-running ~10 ``putText`` calls
+        every frame.
+        """
+        if self._chrome_key == (h, w):
+            return
+        self._chrome_key = (h, w)
+
+        chrome = np.zeros((h, w, 4), dtype=np.uint8)
+        bg = (*_BG, int(0.65 * 255))
+        grey = (*_GREY, 255)
+
+        # Left panel: gesture + finger block
+        cv2.rectangle(chrome, (10, 10), (290, 180), bg, -1)
+        cv2.putText(chrome, "GESTURE", (20, 35), _FONT, 0.45, grey, 1, cv2.LINE_AA)
+        cv2.putText(chrome, "FINGERS", (20, 101), _FONT, 0.45, grey, 1, cv2.LINE_AA)
+        for i, label in enumerate(_FINGER_LABELS):
+            cv2.putText(chrome, label, (15 + i * 52, 153), _FONT, 0.3,
+                        grey, 1, cv2.LINE_AA)
+
+        # Right panel: command log
+        log_w, log_h = 300, 20 + self.CMD_LOG_SIZE * 22
+        lx = max(w - log_w - 10, 0)
+        cv2.rectangle(chrome, (lx, 10), (lx + log_w, 10 + log_h), bg, -1)
+        cv2.putText(chrome, "HID COMMANDS", (lx + 10, 32), _FONT, 0.45,
+                    grey, 1, cv2.LINE_AA)
+
+        # Cache premultiplied panel ROIs so per-frame compositing is two
+        # small multiply-adds (+0.5 baked in so the uint8 cast rounds).
+        self._chrome_rois = []
+        for x, y, pw, ph in ((10, 10, 280, 170), (lx, 10, log_w, log_h)):
+            roi = chrome[y:y + ph, x:min(x + pw, w)]
+            alpha = roi[..., 3:4].astype(np.float32) / 255.0
+            premul = roi[..., :3].astype(np.float32) * alpha + 0.5
+            self._chrome_rois.append((x, y, premul, 1.0 - alpha))
 
     def _calc_fps(self) -> float:
-        ts = self._fps_ts
-        if len(ts) < 2:
-            return 0.0
-        span = ts[-1] - ts[0]
-        if span <= 0:
-            return 0.0
-        return (len(ts) - 1) / span
+        period = self._frame_period_ewm
+        return 1.0 / period if period > 0 else 0.0
@@ -3,35 +3,86 @@ conftest.py
 Shared pytest fixtures for the GestureLink test suite.
 """
 
+import os
 import sys
 from pathlib import Path
 
 # Ensure the repo root is on sys.path so src packages are importable
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+import numpy as np
 import pytest
-from src.vision.gesture_detector import HandResult, Landmark
+from src.vision.gesture_detector import HandResult
 from src.vision.gesture_mapper import GestureMapper
 
 
+# ---------------------------------------------------------------------------
+# Stress-test gating
+#
+# The 10k-iteration stress tests are load tests, not correctness tests:
+# under a tracing interpreter (coverage, debugger) they run ~50x slower
+# while adding zero coverage signal, so the coverage stage skips them.
+# ---------------------------------------------------------------------------
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--runstress", action="store_true", default=False,
+        help="run stress tests even under coverage/debug tracing",
+    )
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers", "stress: high-iteration load test, skipped under tracing"
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--runstress"):
+        return
+    if sys.gettrace() is None and "COVERAGE_RUN" not in os.environ:
+        return
+    skip = pytest.mark.skip(
+        reason="stress tests skipped under tracing (use --runstress to force)"
+    )
+    for item in items:
+        if "stress" in item.keywords:
+            item.add_marker(skip)
+
+
 # ---------------------------------------------------------------------------
 # Helpers to build synthetic HandResult objects
 # ---------------------------------------------------------------------------
 
-def _make_landmarks(positions: dict) -> list:
+# Read-only default pose: every make_hand() copies this once instead of
+# constructing 21 Landmark objects per call.
+_DEFAULT_XYZ = np.empty((21, 3), dtype=np.float32)
+_DEFAULT_XYZ[:] = (0.5, 0.5, 0.0)
+_DEFAULT_XYZ.setflags(write=False)
+
+
+def _make_landmarks(positions: dict) -> np.ndarray:
     """
-    Build a 21-landmark list.
+    Build a (21, 3) landmark array.
     positions: dict of {index: (x, y, z)} for landmarks you want to set.
     Everything else defaults to (0.5, 0.5, 0.0).
     """
-    lms = [Landmark(0.5, 0.5, 0.0) for _ in range(21)]
-    for idx, (x, y, z) in positions.items():
-        lms[idx] = Landmark(x, y, z)
+    lms = _DEFAULT_XYZ.copy()
+    for idx, pos in positions.items():
+        lms[idx] = pos
     return lms
 
 
+def make_hand_from_array(a: np.ndarray, handedness: str = "Right") -> HandResult:
+    """
+    HandResult straight from a (21, 3) float32 landmark array — the
+    layout HandResult stores natively, so construction is zero-copy.
+    """
+    return HandResult(landmarks=a, handedness=handedness)
+
+
 def make_hand(positions: dict, handedness: str = "Right") -> HandResult:
-    return HandResult(landmarks=_make_landmarks(positions), handedness=handedness)
+    return make_hand_from_array(_make_landmarks(positions), handedness)
 
 
 # MediaPipe landmark indices used in tests
@@ -52,6 +103,84 @@ PINKY_TIP      = 20
 PINKY_PIP      = 18
 
 
+# ---------------------------------------------------------------------------
+# Frozen random-hand corpus
+#
+# One seeded vectorized draw at import, shared by every module: hands are
+# reproducible across runs (aids `pytest --lf` triage) and no test loop
+# pays per-hand RNG cost.
+# ---------------------------------------------------------------------------
+
+POOL_SIZE = 20_000
+
+_FINGER_TIPS = np.array([INDEX_TIP, MIDDLE_TIP, RING_TIP, PINKY_TIP])
+_FINGER_PIPS = np.array([INDEX_PIP, MIDDLE_PIP, RING_PIP, PINKY_PIP])
+_FINGER_MCPS = np.array([INDEX_MCP, MIDDLE_MCP, RING_MCP, PINKY_MCP])
+_THUMB_IDS   = np.array([THUMB_TIP, THUMB_IP])
+
+
+def _build_hand_pool() -> np.ndarray:
+    """Random hands with plausible finger structure, as one tensor."""
+    rng = np.random.default_rng(42)
+    r = rng.random((POOL_SIZE, 21, 3), dtype=np.float32)
+
+    pool = np.empty((POOL_SIZE, 21, 3), dtype=np.float32)
+    pool[:] = (0.5, 0.5, 0.0)                      # make_hand default pose
+
+    x = r[:, _FINGER_TIPS, 0]
+    y = r[:, _FINGER_TIPS, 1]
+    # Branchless sign pick: bool * 2k - k gives +/-k without np.where's
+    # float64 round trip, and lands on the exact same float32 values.
+    pip_sign = (r[:, _FINGER_PIPS, 2] > 0.5) * np.float32(0.2) - np.float32(0.1)
+    mcp_sign = (r[:, _FINGER_MCPS, 2] > 0.5) * np.float32(0.3) - np.float32(0.15)
+
+    pool[:, _FINGER_TIPS, 0] = x
+    pool[:, _FINGER_TIPS, 1] = y
+    pool[:, _FINGER_PIPS, 0] = x
+    pool[:, _FINGER_PIPS, 1] = y + pip_sign
+    pool[:, _FINGER_MCPS, 0] = x
+    pool[:, _FINGER_MCPS, 1] = y + mcp_sign
+
+    pool[:, _THUMB_IDS, :2] = r[:, _THUMB_IDS, :2]
+    pool[:, WRIST] = (0.5, 0.8, 0.0)
+    return pool
+
+
+HAND_POOL = _build_hand_pool()
+
+
+def hand_from_row(i: int) -> HandResult:
+    """HandResult backed by one corpus row (wraps at the pool size)."""
+    return make_hand_from_array(HAND_POOL[i % POOL_SIZE])
+
+
 @pytest.fixture()
 def default_mapper() -> GestureMapper:
     return GestureMapper(screen_w=1920, screen_h=1080)
+
+
+# Canonical poses used by several tests.  HandResult is treated as
+# immutable in the suite, so these are built once per module instead of
+# re-running make_hand in every test body.
+
+@pytest.fixture(scope="module")
+def fist_hand() -> HandResult:
+    """A fist: all fingers curled, thumb tucked."""
+    return make_hand({
+        THUMB_TIP:  (0.5, 0.6, 0.0), THUMB_IP:   (0.5, 0.55, 0.0),
+        INDEX_TIP:  (0.5, 0.7, 0.0), INDEX_PIP:  (0.5, 0.6, 0.0),  INDEX_MCP:  (0.5, 0.55, 0.0),
+        MIDDLE_TIP: (0.5, 0.7, 0.0), MIDDLE_PIP: (0.5, 0.6, 0.0),  MIDDLE_MCP: (0.5, 0.55, 0.0),
+        RING_TIP:   (0.5, 0.7, 0.0), RING_PIP:   (0.5, 0.6, 0.0),  RING_MCP:   (0.5, 0.55, 0.0),
+        PINKY_TIP:  (0.5, 0.7, 0.0), PINKY_PIP:  (0.5, 0.6, 0.0),  PINKY_MCP:  (0.5, 0.55, 0.0),
+        WRIST:      (0.5, 0.8, 0.0),
+    })
+
+
+@pytest.fixture(scope="module")
+def pointer_hand() -> HandResult:
+    """Index finger extended, everything else at the default pose."""
+    return make_hand({
+        INDEX_TIP: (0.5, 0.3, 0.0),
+        INDEX_PIP: (0.5, 0.5, 0.0),
+        INDEX_MCP: (0.5, 0.6, 0.0),
+    })